@@ -6,10 +6,15 @@ It wires configuration, blueprints, Jinja globals, and error handlers.
 from __future__ import annotations
 
 import os
+import threading
 from typing import Any
 
-from dotenv import load_dotenv
-from flask import Flask, jsonify, render_template
+from flask import Flask, Response, render_template, request
+
+# Static JSON error bodies; a fresh Response is built per error so that
+# after-request hooks never mutate a shared object.
+_ERR_404_BODY = b'{"error":"Not Found"}'
+_ERR_500_BODY = b'{"error":"Internal Server Error"}'
 
 
 def _wants_json() -> bool:
@@ -17,8 +22,6 @@ def _wants_json() -> bool:
 
     This is used for unified error handling.
     """
-    from flask import request
-
     best = request.accept_mimetypes.best_match(["application/json", "text/html"])
     return best == "application/json" and (
         request.accept_mimetypes[best] > request.accept_mimetypes["text/html"]
@@ -35,8 +38,13 @@ def create_app(config_name: str | None = None) -> Flask:
     Returns:
         A configured Flask application instance.
     """
-    # Load environment variables from .env if present
-    load_dotenv()
+    # Load environment variables from .env if present. Serverless platforms
+    # inject env vars directly, so skip importing dotenv and the .env file
+    # search on their cold starts.
+    if not (os.getenv("VERCEL") or os.getenv("NETLIFY")):
+        from dotenv import load_dotenv
+
+        load_dotenv()
 
     app = Flask(__name__, static_folder=None)
 
@@ -51,6 +59,24 @@ def create_app(config_name: str | None = None) -> Flask:
 
     app.register_blueprint(weather_bp)
 
+    # Build the weather service once per process. Routes build it lazily if
+    # no key was configured at startup or the eager build failed.
+    if app.config.get("WEATHER_API_KEY"):
+        from .weather.service import WeatherService, build_cache_backend_from_env, warm_up
+
+        try:
+            app.extensions["weather_svc"] = WeatherService(
+                api_key=app.config["WEATHER_API_KEY"],
+                cache=build_cache_backend_from_env(),
+                ttl_seconds=int(app.config.get("CACHE_TTL", 600)),
+            )
+        except Exception:
+            # e.g. an unwritable cache dir on a read-only filesystem; keep
+            # serving pages and let the API routes report the error.
+            app.logger.warning("Weather service unavailable at startup", exc_info=True)
+        # Get a live pooled connection to WeatherAPI off the request path
+        threading.Thread(target=warm_up, name="weather-warmup", daemon=True).start()
+
     # Jinja globals or filters
     @app.context_processor
     def inject_globals() -> dict[str, Any]:
@@ -63,13 +89,13 @@ def create_app(config_name: str | None = None) -> Flask:
     @app.errorhandler(404)
     def not_found(err):  # type: ignore[no-redef]
         if _wants_json():
-            return jsonify({"error": "Not Found"}), 404
+            return Response(_ERR_404_BODY, status=404, mimetype="application/json")
         return render_template("base.html", page_title="Not Found"), 404
 
     @app.errorhandler(500)
     def server_error(err):  # type: ignore[no-redef]
         if _wants_json():
-            return jsonify({"error": "Internal Server Error"}), 500
+            return Response(_ERR_500_BODY, status=500, mimetype="application/json")
         return render_template("base.html", page_title="Server Error"), 500
 
     return app
@@ -5,6 +5,7 @@ Provides Development and Production settings loaded from environment.
 from __future__ import annotations
 
 import os
+from functools import lru_cache
 
 
 class Config:
@@ -30,6 +31,7 @@ class ProductionConfig(Config):
     DEBUG: bool = False
 
 
+@lru_cache(maxsize=4)
 def get_config(name: str) -> type[Config]:
     """Map a name to a config class."""
     key = (name or "development").lower()
@@ -5,7 +5,16 @@ import re
 from dataclasses import dataclass
 
 
-CITY_RE = re.compile(r"^[\w\-\s\.,]{1,80}$", re.IGNORECASE)
+# ASCII-only class for the common case; no Unicode table lookups per char.
+CITY_RE = re.compile(r"[A-Za-z0-9 .,_-]{1,80}", re.ASCII)
+# Fallback for non-ASCII city names (e.g. "São Paulo"); like CITY_RE, only a
+# plain space is allowed as whitespace.
+CITY_UNICODE_RE = re.compile(r"[\w\-\. ,]{1,80}")
+
+
+def _is_valid_city(s: str) -> bool:
+    pattern = CITY_RE if s.isascii() else CITY_UNICODE_RE
+    return pattern.fullmatch(s) is not None
 
 
 @dataclass
@@ -14,7 +23,7 @@ class CityQuery:
     units: str = "metric"
 
     def validate(self) -> None:
-        if not self.city or not CITY_RE.match(self.city.strip()):
+        if not self.city or not _is_valid_city(self.city.strip()):
             raise ValueError("Invalid city name")
         if self.units not in {"metric", "imperial"}:
             raise ValueError("Invalid units")
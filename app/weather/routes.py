@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from typing import Any
 
-from flask import Blueprint, current_app, jsonify, render_template, request
+from flask import Blueprint, Response, current_app, jsonify, render_template, request
 
 from . import weather_bp
 from .service import (
@@ -15,6 +15,40 @@ from .service import (
     NetworkError,
 )
 
+# Pre-serialized error bodies for the JSON API (status, body).
+_API_ERRORS: dict[type[Exception], tuple[int, bytes]] = {
+    MissingApiKey: (500, b'{"ok":false,"error":"Missing API key"}'),
+    CityNotFound: (404, b'{"ok":false,"error":"City not found"}'),
+    ApiRateLimited: (429, b'{"ok":false,"error":"Rate limited"}'),
+    NetworkError: (503, b'{"ok":false,"error":"Network error"}'),
+}
+_UNEXPECTED_ERROR: tuple[int, bytes] = (500, b'{"ok":false,"error":"Unexpected server error"}')
+
+
+def _api_error(exc: Exception) -> tuple[int, bytes]:
+    """Map an exception (or any subclass) to its pre-serialized error body."""
+    for cls in type(exc).__mro__:
+        if cls in _API_ERRORS:
+            return _API_ERRORS[cls]
+    return _UNEXPECTED_ERROR
+
+
+def _get_service() -> WeatherService:
+    """Return the app-wide WeatherService, building it on first use.
+
+    `create_app` builds it up front when an API key is set; this only falls
+    back to the env-driven factory when no service exists yet.
+    """
+    svc = current_app.extensions.get("weather_svc")
+    if svc is None:
+        svc = WeatherService(
+            api_key=current_app.config.get("WEATHER_API_KEY"),
+            cache=build_cache_backend_from_env(),
+            ttl_seconds=int(current_app.config.get("CACHE_TTL", 600)),
+        )
+        current_app.extensions["weather_svc"] = svc
+    return svc
+
 
 @weather_bp.get("/")
 def index():
@@ -40,21 +74,13 @@ def api_weather():
     units = (request.args.get("units") or "metric").strip()
 
     try:
-        api_key = current_app.config.get("WEATHER_API_KEY")
-        cache = build_cache_backend_from_env()
-        svc = WeatherService(api_key=api_key, cache=cache, ttl_seconds=int(current_app.config.get("CACHE_TTL", 600)))
+        svc = _get_service()
         payload, stale = svc.get_weather(city, units=units)
-        return jsonify({"ok": True, "stale": stale, "data": payload.model_dump()}), 200
-    except MissingApiKey:
-        return jsonify({"ok": False, "error": "Missing API key"}), 500
-    except CityNotFound:
-        return jsonify({"ok": False, "error": "City not found"}), 404
-    except ApiRateLimited:
-        return jsonify({"ok": False, "error": "Rate limited"}), 429
-    except NetworkError:
-        return jsonify({"ok": False, "error": "Network error"}), 503
-    except Exception:
-        return jsonify({"ok": False, "error": "Unexpected server error"}), 500
+        data = payload if isinstance(payload, dict) else payload.model_dump()
+        return jsonify({"ok": True, "stale": stale, "data": data}), 200
+    except Exception as e:
+        status, body = _api_error(e)
+        return Response(body, status=status, mimetype="application/json")
 
 
 @weather_bp.get("/api/suggest")
@@ -68,9 +94,7 @@ def api_suggest():
     if len(q) < 2:
         return jsonify({"ok": True, "data": []})
     try:
-        api_key = current_app.config.get("WEATHER_API_KEY")
-        cache = build_cache_backend_from_env()
-        svc = WeatherService(api_key=api_key, cache=cache, ttl_seconds=int(current_app.config.get("CACHE_TTL", 600)))
+        svc = _get_service()
         items = svc.search_locations(q)
         return jsonify({"ok": True, "data": items}), 200
     except Exception:
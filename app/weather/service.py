@@ -6,19 +6,78 @@ responses using Pydantic, and caches results using a pluggable backend
 """
 from __future__ import annotations
 
-import hashlib
-import json
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
+from functools import lru_cache
+from hashlib import blake2b
 from pathlib import Path
 from typing import Any, Optional, Tuple
 
+import orjson
 import requests
+from cachetools import TTLCache
 from pydantic import BaseModel, ConfigDict, Field, ValidationError
-
-
-DEFAULT_TTL_SECONDS = 600  # 10 minutes
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# Per-endpoint cache lifetimes (short/normal/long)
+TTL_CURRENT = 600  # 10 minutes: conditions change throughout the hour
+TTL_FORECAST = 3600  # 1 hour: forecasts update a few times per day
+TTL_SEARCH = 86400  # 1 day: location search results are effectively static
+
+DEFAULT_TTL_SECONDS = TTL_CURRENT
+# Expired weather parts are served stale (while revalidating) for at most this
+# many TTLs past expiry; older ones are refetched before responding.
+MAX_STALE_FACTOR = 4
+# Redis keeps entries this long past their logical expiry so they can still
+# be served stale, revalidated, or used as a fallback during API outages.
+STALE_GRACE_SECONDS = 86400
+L1_TTL_SECONDS = 60  # in-process cache sits in front of File/Redis
+L1_MAXSIZE = 256
+SEARCH_L1_MAXSIZE = 1024
+# WeatherAPI caps search.json results; a list this long may be truncated, so
+# it cannot be filtered to answer longer queries.
+SEARCH_UPSTREAM_CAP = 10
+
+# Shared HTTP session so current/forecast/search calls reuse pooled
+# keep-alive connections (and TLS sessions) to WeatherAPI.
+_SESSION = requests.Session()
+_SESSION.mount(
+    "https://",
+    HTTPAdapter(
+        pool_connections=10,
+        pool_maxsize=20,
+        max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]),
+    ),
+)
+
+# Small pool for overlapping the I/O-bound current + forecast requests; the
+# calling thread fetches current conditions itself and only the forecast is
+# submitted here.
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="weather")
+# Separate pool for background revalidation, so slow refreshes against a
+# hanging upstream can never starve request-path fetches.
+_REFRESH_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="weather-refresh")
+
+
+def close() -> None:
+    """Close the shared HTTP session and release pooled connections."""
+    _SESSION.close()
+
+
+def warm_up() -> None:
+    """Open a pooled connection to WeatherAPI ahead of the first request.
+
+    Pays DNS resolution and the TCP/TLS handshake up front; best effort only.
+    """
+    try:
+        _SESSION.head(f"{WeatherService.BASE_URL}/", timeout=2)
+    except Exception:
+        pass
 
 
 class ServiceError(Exception):
@@ -85,6 +144,41 @@ class WeatherPayload(BaseModel):
     source: str
 
 
+# Conditional-request validators kept with cache entries ("etag", "last_modified").
+Validators = dict[str, str]
+
+# Separately cached payload parts and the JSON type each one is stored as.
+_PARTS: dict[str, type] = {"current": dict, "forecast": list}
+
+# Bound pydantic-core entry points for the hot cache read/write paths.
+_VALIDATE_PAYLOAD = WeatherPayload.__pydantic_validator__.validate_python
+_DUMP_PAYLOAD = WeatherPayload.__pydantic_serializer__.to_python
+_DUMP_CURRENT = CurrentWeather.__pydantic_serializer__.to_python
+_DUMP_FORECAST_DAY = ForecastDay.__pydantic_serializer__.to_python
+
+try:
+    # Warm the validator so the first request doesn't pay for it
+    _VALIDATE_PAYLOAD(
+        {
+            "units": "metric",
+            "current": {
+                "city": "",
+                "country": "",
+                "temp": 0.0,
+                "feelsLike": 0.0,
+                "humidity": 0,
+                "wind": 0.0,
+                "condition": {"main": "", "description": "", "icon": ""},
+                "dt": 0,
+            },
+            "forecast": [],
+            "source": "warmup",
+        }
+    )
+except ValidationError:  # pragma: no cover - warmup only
+    pass
+
+
 # -----------------------------
 # Cache backends
 # -----------------------------
@@ -94,9 +188,21 @@ class CacheBackend:
     """Minimal cache interface."""
 
     def get(self, key: str) -> Optional[dict[str, Any]]:  # pragma: no cover - interface
+        """Return the stored entry, or None.
+
+        Entries carry `__exp__` (expiry timestamp) and `__expired__`; expired
+        entries are still returned so callers can serve them as stale.
+        """
         raise NotImplementedError
 
-    def set(self, key: str, value: dict[str, Any]) -> None:  # pragma: no cover - interface
+    def set(
+        self, key: str, value: dict[str, Any], ttl: Optional[int] = None
+    ) -> None:  # pragma: no cover - interface
+        """Store `value`; `ttl` overrides the backend's default lifetime.
+
+        Backends may add bookkeeping keys to `value` in place, so callers
+        should pass a dict they own.
+        """
         raise NotImplementedError
 
 
@@ -109,52 +215,65 @@ class FileCache(CacheBackend):
         self.root.mkdir(parents=True, exist_ok=True)
 
     def _path_for(self, key: str) -> Path:
-        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        # Non-cryptographic use: only names the file, so a short BLAKE2b is enough
+        digest = blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
         return self.root / f"{digest}.json"
 
     def get(self, key: str) -> Optional[dict[str, Any]]:
         path = self._path_for(key)
-        if not path.exists():
-            return None
         try:
-            with path.open("r", encoding="utf-8") as f:
-                payload = json.load(f)
+            st = os.stat(path)
+            payload = orjson.loads(path.read_bytes())
+            if not isinstance(payload, dict):
+                return None
             # Expired? Our caller can still use as stale if needed.
-            payload["__expired__"] = (time.time() - payload.get("__ts__", 0)) > self.ttl_seconds
+            if "__exp__" not in payload:
+                payload["__exp__"] = st.st_mtime + self.ttl_seconds
+            payload["__expired__"] = time.time() > payload["__exp__"]
             return payload
         except Exception:
+            # Missing (FileNotFoundError), unreadable or malformed entry
             return None
 
-    def set(self, key: str, value: dict[str, Any]) -> None:
+    def set(self, key: str, value: dict[str, Any], ttl: Optional[int] = None) -> None:
         path = self._path_for(key)
-        value = {**value, "__ts__": time.time()}
-        with path.open("w", encoding="utf-8") as f:
-            json.dump(value, f)
+        if ttl is not None:
+            value["__exp__"] = time.time() + ttl
+        # Write to a private temp file and swap it in so readers never see a
+        # partially written entry. The file mtime doubles as the write time.
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(orjson.dumps(value))
+        os.replace(tmp, path)
 
 
 @dataclass
 class RedisCache(CacheBackend):
     url: str
     ttl_seconds: int = DEFAULT_TTL_SECONDS
+    stale_grace_seconds: int = STALE_GRACE_SECONDS
 
     def __post_init__(self) -> None:
         try:
             import redis  # type: ignore
         except Exception as e:  # pragma: no cover - import guard
             raise RuntimeError("redis package is required for RedisCache") from e
-        self._redis = redis.from_url(self.url, decode_responses=True)
+        self._redis = redis.from_url(self.url, decode_responses=False)
 
     def get(self, key: str) -> Optional[dict[str, Any]]:
         raw = self._redis.get(key)
         if not raw:
             return None
-        payload = json.loads(raw)
-        payload["__expired__"] = (time.time() - payload.get("__ts__", 0)) > self.ttl_seconds
+        payload = orjson.loads(raw)
+        payload.setdefault("__exp__", 0)
+        payload["__expired__"] = time.time() > payload["__exp__"]
         return payload
 
-    def set(self, key: str, value: dict[str, Any]) -> None:
-        value = {**value, "__ts__": time.time()}
-        self._redis.setex(key, self.ttl_seconds, json.dumps(value))
+    def set(self, key: str, value: dict[str, Any], ttl: Optional[int] = None) -> None:
+        ttl = self.ttl_seconds if ttl is None else ttl
+        value["__exp__"] = time.time() + ttl
+        # Outlive the logical expiry, otherwise Redis deletes the key before
+        # `get` could ever report it as expired.
+        self._redis.setex(key, max(1, ttl + self.stale_grace_seconds), orjson.dumps(value))
 
 
 # -----------------------------
@@ -162,6 +281,11 @@ class RedisCache(CacheBackend):
 # -----------------------------
 
 
+@lru_cache(maxsize=4096)
+def _cache_key(city: str, units: str) -> str:
+    return f"weather:{city.strip().lower()}:{units}"
+
+
 class WeatherService:
     """Fetch and cache weather data from WeatherAPI.com.
 
@@ -169,7 +293,7 @@ class WeatherService:
     It aggregates the forecast into the next 3 distinct days.
     """
 
-    BASE_URL = "http://api.weatherapi.com/v1"
+    BASE_URL = "https://api.weatherapi.com/v1"
 
     def __init__(
         self,
@@ -182,83 +306,218 @@ class WeatherService:
         self.api_key = api_key
         self.cache = cache or FileCache(Path(os.getenv("WEATHER_CACHE_DIR", ".cache/weather")))
         self.ttl = ttl_seconds
+        # Per-process L1 in front of the shared backend; kept shorter-lived
+        # so entries rewritten by other workers are picked up quickly.
+        self._l1: TTLCache[str, dict[str, Any]] = TTLCache(
+            maxsize=L1_MAXSIZE, ttl=max(1, min(ttl_seconds, L1_TTL_SECONDS))
+        )
+        # Autocomplete results by lowercased query; also answers longer
+        # queries that extend a remembered prefix (see `search_locations`).
+        self._search_l1: TTLCache[str, list[dict[str, str]]] = TTLCache(
+            maxsize=SEARCH_L1_MAXSIZE, ttl=TTL_SEARCH
+        )
+        self._l1_lock = threading.RLock()
+        self._inflight: set[str] = set()
 
-    @staticmethod
-    def _cache_key(city: str, units: str) -> str:
-        return f"weather:{city.strip().lower()}:{units}"
-
-    def get_weather(self, city: str, units: str = "metric") -> Tuple[WeatherPayload, bool]:
+    def get_weather(
+        self, city: str, units: str = "metric"
+    ) -> Tuple[WeatherPayload | dict[str, Any], bool]:
         """Return weather payload and a stale flag.
 
-        If the API is unavailable but cached data exists, returns the cached
-        data and marks it stale.
+        Fresh cache hits are returned as an already-dumped payload dict, since
+        entries were validated when written. Everything else is a
+        `WeatherPayload`. Only the parts (current/forecast) that are missing
+        from the cache are fetched.
+
+        Recently expired cache entries are served immediately and marked stale
+        while a background refresh updates the cache (stale-while-revalidate).
+        Entries more than `MAX_STALE_FACTOR` TTLs past expiry are refetched
+        first and only served (as stale) if the API is unavailable.
         """
         city = city.strip()
         if not city:
             raise CityNotFound("City is required")
 
-        key = self._cache_key(city, units)
-        cached = self.cache.get(key)
-        if cached and not cached.get("__expired__", False):
+        key = _cache_key(city, units)
+        with self._l1_lock:
+            hit = self._l1.get(key)
+        if hit is not None:
+            return hit, False
+
+        # Current conditions and forecast are cached separately so each can
+        # expire on its own schedule.
+        parts: dict[str, Any] = {}
+        expired: list[str] = []
+        too_old: dict[str, dict[str, Any]] = {}
+        now = time.time()
+        for part, kind in _PARTS.items():
+            entry = self.cache.get(f"{key}:{part}")
+            if not entry or not isinstance(entry.get("data"), kind):
+                continue
+            if entry.get("__expired__", False):
+                max_stale = MAX_STALE_FACTOR * self._ttl_for(part)
+                if now > entry.get("__exp__", 0) + max_stale:
+                    # Too old to serve while revalidating; only a fallback
+                    too_old[part] = entry
+                    continue
+                expired.append(part)
+            parts[part] = entry["data"]
+
+        if len(parts) == len(_PARTS) and not expired:
+            data = {"units": units, **parts, "source": "live"}
+            with self._l1_lock:
+                self._l1[key] = data
+            return data, False
+
+        missing = [part for part in _PARTS if part not in parts]
+        if missing:
             try:
-                model = WeatherPayload.model_validate(cached["data"])
-                return model, False
-            except ValidationError:
-                # Ignore corrupt cache entries
-                pass
-
-        # Perform fresh fetch
+                parts.update(self._fetch_parts(key, city, units, missing, entries=too_old))
+            except (NetworkError, ApiRateLimited):
+                # API unavailable: fall back to old entries, if we have them
+                if any(part not in too_old for part in missing):
+                    raise
+                parts.update({part: entry["data"] for part, entry in too_old.items()})
+                expired.extend(too_old)
         try:
-            current = self._get_current(city, units)
-            forecast = self._get_forecast(city, units)
-            payload = WeatherPayload(
-                units=units,
-                current=current,
-                forecast=forecast,
-                source="live",
+            payload = _VALIDATE_PAYLOAD(
+                {"units": units, **parts, "source": "cache" if expired else "live"}
             )
-            self.cache.set(key, {"data": payload.model_dump(by_alias=True)})
-            return payload, False
-        except CityNotFound:
-            raise
-        except ApiRateLimited:
-            # Use cache if available
-            if cached:
-                try:
-                    model = WeatherPayload.model_validate(cached["data"])
-                    model.source = "cache"
-                    return model, True
-                except ValidationError:
-                    pass
-            raise
-        except (requests.RequestException, NetworkError):
-            # Use stale cache if available
-            if cached:
-                try:
-                    model = WeatherPayload.model_validate(cached["data"])
-                    model.source = "cache"
-                    return model, True
-                except ValidationError:
-                    pass
-            raise NetworkError("Network error querying weather API")
+        except ValidationError:
+            # Corrupt cache entries: refetch everything
+            expired = []
+            parts = self._fetch_parts(key, city, units, list(_PARTS))
+            payload = WeatherPayload(units=units, **parts, source="live")
+
+        if expired:
+            self._schedule_refresh(key, city, units, expired)
+            return payload, True
+        with self._l1_lock:
+            self._l1[key] = _DUMP_PAYLOAD(payload)
+        return payload, False
+
+    def _ttl_for(self, part: str) -> int:
+        return self.ttl if part == "current" else TTL_FORECAST
+
+    def _fetch_parts(
+        self,
+        key: str,
+        city: str,
+        units: str,
+        parts: list[str],
+        parallel: bool = True,
+        entries: Optional[dict[str, dict[str, Any]]] = None,
+    ) -> dict[str, Any]:
+        """Fetch `parts` from the API and cache each under its own TTL.
+
+        When the existing cache `entries` are given, their validators are sent
+        as a conditional request; a 304 just renews the stored data.
+        """
+        fetchers = {"current": self._get_current, "forecast": self._get_forecast}
+        entries = entries or {}
+        validators = {
+            part: {k: entries[part][k] for k in ("etag", "last_modified") if entries[part].get(k)}
+            for part in parts
+            if entries.get(part)
+        }
+        try:
+            if parallel and len(parts) > 1:
+                # The first part runs on the calling thread, so a request holds
+                # at most one pool worker (for the forecast) at a time.
+                first, *rest = parts
+                futures = {
+                    part: _EXECUTOR.submit(fetchers[part], city, units, validators.get(part))
+                    for part in rest
+                }
+                results = {first: fetchers[first](city, units, validators.get(first))}
+                results.update({part: fut.result() for part, fut in futures.items()})
+            else:
+                results = {
+                    part: fetchers[part](city, units, validators.get(part)) for part in parts
+                }
+        except (requests.RequestException, orjson.JSONDecodeError) as e:
+            raise NetworkError("Network error querying weather API") from e
+
+        fetched: dict[str, Any] = {}
+        for part, (value, part_validators) in results.items():
+            if value is None:
+                # Not modified: keep the stored data
+                fetched[part] = data = entries[part]["data"]
+            elif part == "current":
+                fetched[part] = value
+                data = _DUMP_CURRENT(value)
+            else:
+                fetched[part] = value
+                data = [_DUMP_FORECAST_DAY(day) for day in value]
+            self.cache.set(
+                f"{key}:{part}", {"data": data, **part_validators}, ttl=self._ttl_for(part)
+            )
+        return fetched
+
+    def _schedule_refresh(self, key: str, city: str, units: str, parts: list[str]) -> None:
+        """Refresh expired parts in the background, at most once per key."""
+        with self._l1_lock:
+            if key in self._inflight:
+                return
+            self._inflight.add(key)
+        _REFRESH_EXECUTOR.submit(self._refresh, key, city, units, parts)
+
+    def _refresh(self, key: str, city: str, units: str, parts: list[str]) -> None:
+        # Runs on _REFRESH_EXECUTOR; fetch sequentially so a refresh never
+        # takes workers from the request-path _EXECUTOR.
+        try:
+            entries = {part: self.cache.get(f"{key}:{part}") or {} for part in parts}
+            self._fetch_parts(key, city, units, parts, parallel=False, entries=entries)
+        except Exception:
+            pass  # Keep serving the stale entry until the next attempt
+        finally:
+            with self._l1_lock:
+                self._inflight.discard(key)
 
     # -------------------------
     # Endpoint helpers
     # -------------------------
 
-    def _get_current(self, city: str, units: str) -> CurrentWeather:
-        url = f"{self.BASE_URL}/current.json"
-        params = {"key": self.api_key, "q": city, "aqi": "yes"}
-        r = requests.get(url, params=params, timeout=10)
+    def _request(
+        self, endpoint: str, params: dict[str, Any], city: str, validators: Validators | None
+    ) -> tuple[Optional[dict[str, Any]], Validators]:
+        """GET a WeatherAPI endpoint, replaying cached validators if given.
+
+        Returns the parsed body (None on 304 Not Modified) and the validators
+        (ETag/Last-Modified) to send with the next refresh.
+        """
+        headers: dict[str, str] = {}
+        if validators:
+            if validators.get("etag"):
+                headers["If-None-Match"] = validators["etag"]
+            if validators.get("last_modified"):
+                headers["If-Modified-Since"] = validators["last_modified"]
+        url = f"{self.BASE_URL}/{endpoint}"
+        r = _SESSION.get(url, params=params, headers=headers or None, timeout=10)
+        if r.status_code == 304:
+            return None, validators or {}
         if r.status_code == 400:
-            data = r.json()
+            data = orjson.loads(r.content)
             if "error" in data and "No matching location" in data["error"].get("message", ""):
                 raise CityNotFound(f"City not found: {city}")
         if r.status_code == 429:
             raise ApiRateLimited("Rate limited by WeatherAPI")
         r.raise_for_status()
-        data = r.json()
-        
+        fresh: Validators = {}
+        if r.headers.get("ETag"):
+            fresh["etag"] = r.headers["ETag"]
+        if r.headers.get("Last-Modified"):
+            fresh["last_modified"] = r.headers["Last-Modified"]
+        return orjson.loads(r.content), fresh
+
+    def _get_current(
+        self, city: str, units: str, validators: Validators | None = None
+    ) -> tuple[Optional[CurrentWeather], Validators]:
+        params = {"key": self.api_key, "q": city, "aqi": "yes"}
+        data, validators = self._request("current.json", params, city, validators)
+        if data is None:
+            return None, validators
+
         # Convert to our format
         loc = data["location"]
         curr = data["current"]
@@ -300,21 +559,16 @@ class WeatherService:
             ),
             dt=int(curr["last_updated_epoch"]),
         )
-        return cw
+        return cw, validators
 
-    def _get_forecast(self, city: str, units: str) -> list[ForecastDay]:
-        url = f"{self.BASE_URL}/forecast.json"
+    def _get_forecast(
+        self, city: str, units: str, validators: Validators | None = None
+    ) -> tuple[Optional[list[ForecastDay]], Validators]:
         params = {"key": self.api_key, "q": city, "days": 3, "aqi": "no", "alerts": "no"}
-        r = requests.get(url, params=params, timeout=10)
-        if r.status_code == 400:
-            data = r.json()
-            if "error" in data and "No matching location" in data["error"].get("message", ""):
-                raise CityNotFound(f"City not found: {city}")
-        if r.status_code == 429:
-            raise ApiRateLimited("Rate limited by WeatherAPI")
-        r.raise_for_status()
-        data = r.json()
-        
+        data, validators = self._request("forecast.json", params, city, validators)
+        if data is None:
+            return None, validators
+
         results: list[ForecastDay] = []
         for day_data in data["forecast"]["forecastday"]:
             day = day_data["day"]
@@ -339,20 +593,39 @@ class WeatherService:
                     ),
                 )
             )
-        return results
+        return results, validators
 
     # Suggestions API
     def search_locations(self, q: str, limit: int = 7) -> list[dict[str, str]]:
         q = q.strip()
         if not q:
             return []
+        q_lower = q.lower()
+        hit = self._search_from_memory(q_lower)
+        if hit is not None:
+            return hit[:limit]
+
+        key = f"search:q:{q_lower}"
+        cached = self.cache.get(key)
+        if cached and isinstance(cached.get("data"), list):
+            if not cached.get("__expired__", False):
+                with self._l1_lock:
+                    self._search_l1[q_lower] = cached["data"]
+                return cached["data"][:limit]
+        else:
+            cached = None
         url = f"{self.BASE_URL}/search.json"
         params = {"key": self.api_key, "q": q}
-        r = requests.get(url, params=params, timeout=8)
-        r.raise_for_status()
-        items = r.json() or []
+        try:
+            r = _SESSION.get(url, params=params, timeout=8)
+            r.raise_for_status()
+        except requests.RequestException:
+            if cached:
+                return cached["data"][:limit]
+            raise
+        items = orjson.loads(r.content) or []
         results: list[dict[str, str]] = []
-        for it in items[:limit]:
+        for it in items:
             name = it.get("name", "")
             region = it.get("region") or ""
             country = it.get("country") or ""
@@ -365,16 +638,51 @@ class WeatherService:
                 "lat": str(it.get("lat")),
                 "lon": str(it.get("lon")),
             })
-        return results
+        self.cache.set(key, {"data": results}, ttl=TTL_SEARCH)
+        with self._l1_lock:
+            self._search_l1[q_lower] = results
+        return results[:limit]
+
+    def _search_from_memory(self, q_lower: str) -> Optional[list[dict[str, str]]]:
+        """Answer a search from remembered results for `q_lower` or a prefix.
+
+        Typing "Lon" -> "Lond" -> "London" only needs the first request: the
+        longer queries are served by filtering the results of the longest
+        remembered prefix, provided that list was shorter than the upstream
+        cap and therefore complete. Returns None when the network should be
+        used.
+        """
+        with self._l1_lock:
+            exact = self._search_l1.get(q_lower)
+            if exact is not None:
+                return exact
+            for n in range(len(q_lower) - 1, 0, -1):
+                items = self._search_l1.get(q_lower[:n])
+                if items is not None:
+                    if len(items) >= SEARCH_UPSTREAM_CAP:
+                        return None  # Possibly truncated upstream page
+                    matches = [it for it in items if it["name"].lower().startswith(q_lower)]
+                    return matches or None
+        return None
 
 
 def build_cache_backend_from_env() -> CacheBackend:
-    """Factory to build a cache backend based on environment variables."""
-    backend = os.getenv("CACHE_BACKEND", "file").lower()
-    ttl = int(os.getenv("CACHE_TTL", str(DEFAULT_TTL_SECONDS)))
+    """Factory to build a cache backend based on environment variables.
+
+    Backends are memoized per distinct environment so repeated calls reuse the
+    same client (and its connection pool) instead of rebuilding it.
+    """
+    return _build_cache_backend(
+        os.getenv("CACHE_BACKEND", "file").lower(),
+        int(os.getenv("CACHE_TTL", str(DEFAULT_TTL_SECONDS))),
+        os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+        os.getenv("WEATHER_CACHE_DIR", ".cache/weather"),
+    )
+
+
+@lru_cache(maxsize=1)
+def _build_cache_backend(backend: str, ttl: int, redis_url: str, cache_dir: str) -> CacheBackend:
     if backend == "redis":
-        url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-        return RedisCache(url=url, ttl_seconds=ttl)
+        return RedisCache(url=redis_url, ttl_seconds=ttl)
     # Default: file
-    cache_dir = Path(os.getenv("WEATHER_CACHE_DIR", ".cache/weather"))
-    return FileCache(root=cache_dir, ttl_seconds=ttl)
+    return FileCache(root=Path(cache_dir), ttl_seconds=ttl)
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+import pytest
+
+from app.weather.forms import CityQuery
+
+
+@pytest.mark.parametrize(
+    "city", ["London", "St. Louis", "Stratford-upon-Avon", "São Paulo", "Zürich"]
+)
+def test_valid_city_names(city: str) -> None:
+    CityQuery(city).validate()
+
+
+@pytest.mark.parametrize("city", ["", "   ", "New\tYork", "Paris\x00", "São\tPaulo", "a;b"])
+def test_invalid_city_names(city: str) -> None:
+    with pytest.raises(ValueError):
+        CityQuery(city).validate()
+
+
+def test_city_length_limit() -> None:
+    CityQuery("a" * 80).validate()
+    with pytest.raises(ValueError):
+        CityQuery("a" * 81).validate()
+    CityQuery("é" * 80).validate()
+    with pytest.raises(ValueError):
+        CityQuery("é" * 81).validate()
@@ -57,3 +57,69 @@ def test_api_weather_monkeypatch(client, monkeypatch) -> None:
     js = r.get_json()
     assert js["ok"] is True
     assert js["data"]["current"]["city"] == "London"
+
+
+def test_weather_service_reused_across_requests(app: Flask, monkeypatch) -> None:
+    from app.weather import service as service_mod
+
+    app.config.update(WEATHER_API_KEY="test")
+    monkeypatch.setattr(service_mod.WeatherService, "search_locations", lambda self, q: [])
+
+    client = app.test_client()
+    client.get("/api/suggest?q=Lon")
+    svc = app.extensions["weather_svc"]
+    client.get("/api/suggest?q=Lond")
+    assert app.extensions["weather_svc"] is svc
+
+
+def test_not_found_json(client) -> None:
+    r = client.get("/does-not-exist", headers={"Accept": "application/json"})
+    assert r.status_code == 404
+    assert r.get_json() == {"error": "Not Found"}
+
+
+def test_app_starts_when_cache_backend_fails(tmp_path, monkeypatch) -> None:
+    from app import config as config_mod
+    from app.weather import service as service_mod
+
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    monkeypatch.setattr(config_mod.Config, "WEATHER_API_KEY", "test")
+    monkeypatch.setenv("WEATHER_CACHE_DIR", str(blocker / "cache"))
+    monkeypatch.setattr(service_mod, "warm_up", lambda: None)
+
+    app = create_app("development")
+    assert "weather_svc" not in app.extensions
+
+    client = app.test_client()
+    assert client.get("/").status_code == 200
+    r = client.get("/api/weather?city=London")
+    assert r.status_code == 500
+    assert r.get_json()["ok"] is False
+
+
+@pytest.mark.parametrize(
+    "exc_name, status, error",
+    [
+        ("CityNotFound", 404, "City not found"),
+        ("NetworkError", 503, "Network error"),
+        ("ApiRateLimited", 429, "Rate limited"),
+    ],
+)
+def test_api_weather_error_responses(app: Flask, monkeypatch, exc_name, status, error) -> None:
+    from app.weather import service as service_mod
+
+    exc_type = getattr(service_mod, exc_name)
+    subclass = type(f"Sub{exc_name}", (exc_type,), {})
+
+    app.config.update(WEATHER_API_KEY="test")
+    client = app.test_client()
+    for raised in (exc_type, subclass):
+
+        def fake_get_weather(self, city: str, units: str = "metric"):
+            raise raised("boom")
+
+        monkeypatch.setattr(service_mod.WeatherService, "get_weather", fake_get_weather)
+        r = client.get("/api/weather?city=London")
+        assert r.status_code == status
+        assert r.get_json() == {"ok": False, "error": error}
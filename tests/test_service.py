@@ -1,12 +1,24 @@
 from __future__ import annotations
 
 import json
+import os
+import sys
+import threading
+import time
+import types
 from pathlib import Path
 
 import pytest
 import responses
 
-from app.weather.service import FileCache, WeatherService
+from app.weather.service import (
+    SEARCH_UPSTREAM_CAP,
+    STALE_GRACE_SECONDS,
+    FileCache,
+    RedisCache,
+    WeatherService,
+    _cache_key,
+)
 
 
 @pytest.fixture()
@@ -40,6 +52,11 @@ def _mock_forecast(units: str = "metric") -> dict:
     return {"list": items}
 
 
+def _seed_cache(cache: FileCache, key: str, data: dict) -> None:
+    cache.set(f"{key}:current", {"data": data["current"]})
+    cache.set(f"{key}:forecast", {"data": data["forecast"]})
+
+
 @responses.activate
 def test_get_weather_success(tmp_cache: FileCache) -> None:
     svc = WeatherService(api_key="test", cache=tmp_cache)
@@ -91,3 +108,253 @@ def test_cache_used_on_network_error(tmp_cache: FileCache) -> None:
     payload2, stale2 = svc.get_weather("London", units="metric")
     assert stale2
     assert payload2.current.city == payload.current.city
+
+
+def test_fresh_cache_hit_returns_cached_dict(tmp_cache: FileCache) -> None:
+    svc = WeatherService(api_key="test", cache=tmp_cache)
+    data = {
+        "units": "metric",
+        "current": {
+            "city": "London",
+            "country": "GB",
+            "temp": 10.5,
+            "feels_like": 8.0,
+            "humidity": 75,
+            "wind": 3.2,
+            "condition": {"main": "Clouds", "description": "broken clouds", "icon": "04d"},
+            "dt": 1700000000,
+        },
+        "forecast": [],
+        "source": "live",
+    }
+    _seed_cache(tmp_cache, _cache_key("London", "metric"), data)
+
+    payload, stale = svc.get_weather("London", units="metric")
+    assert not stale
+    assert payload == data
+
+
+def test_per_entry_ttl_overrides_default(tmp_cache: FileCache) -> None:
+    tmp_cache.set("short", {"data": 1}, ttl=-1)
+    tmp_cache.set("long", {"data": 2}, ttl=3600)
+    short, long = tmp_cache.get("short"), tmp_cache.get("long")
+    assert (short["data"], short["__expired__"]) == (1, True)
+    assert (long["data"], long["__expired__"]) == (2, False)
+    assert long["__exp__"] > time.time() + 3500
+
+
+class _FakeRedis:
+    def __init__(self) -> None:
+        self.store: dict[str, bytes] = {}
+        self.ex: dict[str, int] = {}
+
+    def get(self, key: str) -> bytes | None:
+        return self.store.get(key)
+
+    def setex(self, key: str, seconds: int, value: bytes) -> None:
+        self.store[key] = value
+        self.ex[key] = seconds
+
+
+def test_redis_cache_keeps_expired_entries(monkeypatch) -> None:
+    fake = _FakeRedis()
+    monkeypatch.setitem(sys.modules, "redis", types.SimpleNamespace(from_url=lambda *a, **k: fake))
+    cache = RedisCache(url="redis://fake")
+
+    cache.set("k", {"data": 1}, ttl=-1)
+    assert fake.ex["k"] == STALE_GRACE_SECONDS - 1
+    entry = cache.get("k")
+    assert entry["data"] == 1
+    assert entry["__expired__"] is True
+
+
+def test_file_cache_expiry_uses_mtime(tmp_cache: FileCache) -> None:
+    assert tmp_cache.get("missing") is None
+
+    tmp_cache.set("k", {"data": {"a": 1}})
+    entry = tmp_cache.get("k")
+    assert entry["data"] == {"a": 1}
+    assert entry["__expired__"] is False
+
+    old = time.time() - tmp_cache.ttl_seconds - 5
+    os.utime(tmp_cache._path_for("k"), (old, old))
+    entry = tmp_cache.get("k")
+    assert entry["__expired__"] is True
+    assert entry["__exp__"] == pytest.approx(old + tmp_cache.ttl_seconds)
+
+
+def test_file_cache_non_object_entry_is_a_miss(tmp_cache: FileCache) -> None:
+    tmp_cache._path_for("k").write_bytes(b"[1,2]")
+    assert tmp_cache.get("k") is None
+
+
+def test_l1_cache_serves_repeat_hits(tmp_cache: FileCache) -> None:
+    svc = WeatherService(api_key="test", cache=tmp_cache)
+    key = _cache_key("Paris", "metric")
+    _seed_cache(tmp_cache, key, {"current": {"city": "Paris"}, "forecast": []})
+
+    first, _ = svc.get_weather("Paris")
+    for part in ("current", "forecast"):
+        tmp_cache._path_for(f"{key}:{part}").unlink()
+    second, stale = svc.get_weather("Paris")
+    assert not stale
+    assert second is first
+
+
+def test_expired_entry_served_stale_while_revalidating(tmp_cache: FileCache, monkeypatch) -> None:
+    svc = WeatherService(api_key="test", cache=tmp_cache)
+    key = _cache_key("Oslo", "metric")
+    data = {
+        "units": "metric",
+        "current": {
+            "city": "Oslo",
+            "country": "NO",
+            "temp": 1.0,
+            "feels_like": -2.0,
+            "humidity": 80,
+            "wind": 4.0,
+            "condition": {"main": "Snow", "description": "snow", "icon": "13d"},
+            "dt": 1700000000,
+        },
+        "forecast": [],
+        "source": "live",
+    }
+    _seed_cache(tmp_cache, key, data)
+    old = time.time() - tmp_cache.ttl_seconds - 5
+    os.utime(tmp_cache._path_for(f"{key}:current"), (old, old))
+
+    release = threading.Event()
+    done = threading.Event()
+    calls: list[tuple[str, list[str]]] = []
+
+    def fake_refresh(self, key: str, city: str, units: str, parts: list[str]) -> None:
+        calls.append((key, parts))
+        release.wait(timeout=5)
+        with self._l1_lock:
+            self._inflight.discard(key)
+        done.set()
+
+    monkeypatch.setattr(WeatherService, "_refresh", fake_refresh)
+
+    payload, stale = svc.get_weather("Oslo")
+    payload2, stale2 = svc.get_weather("Oslo")
+    release.set()
+    assert done.wait(timeout=5)
+
+    assert stale and stale2
+    assert payload.source == "cache"
+    assert payload.current.city == "Oslo"
+    assert calls == [(key, ["current"])]
+
+
+def _weatherapi_current(city: str) -> dict:
+    return {
+        "location": {"name": city, "country": "X"},
+        "current": {
+            "temp_c": 20.0,
+            "feelslike_c": 19.0,
+            "wind_kph": 7.2,
+            "humidity": 40,
+            "condition": {"text": "Sunny", "icon": "//cdn.weatherapi.com/113.png"},
+            "last_updated_epoch": 1800000000,
+        },
+    }
+
+
+@responses.activate
+def test_too_old_entry_refetched_before_serving(tmp_cache: FileCache) -> None:
+    svc = WeatherService(api_key="test", cache=tmp_cache)
+    key = _cache_key("Lima", "metric")
+    _seed_cache(tmp_cache, key, {"current": {"city": "Lima"}, "forecast": []})
+    ancient = time.time() - 30 * 86400
+    os.utime(tmp_cache._path_for(f"{key}:current"), (ancient, ancient))
+    responses.add(
+        responses.GET, f"{svc.BASE_URL}/current.json", json=_weatherapi_current("Lima")
+    )
+
+    payload, stale = svc.get_weather("Lima")
+    assert not stale
+    assert payload.source == "live"
+    assert payload.current.dt == 1800000000
+
+
+@responses.activate
+def test_too_old_entry_served_when_api_unavailable(tmp_cache: FileCache, monkeypatch) -> None:
+    svc = WeatherService(api_key="test", cache=tmp_cache)
+    monkeypatch.setattr(WeatherService, "_schedule_refresh", lambda *args: None)
+    key = _cache_key("Lima", "metric")
+    current = {
+        "city": "Lima",
+        "country": "PE",
+        "temp": 18.0,
+        "feels_like": 18.0,
+        "humidity": 70,
+        "wind": 2.0,
+        "condition": {"main": "Mist", "description": "mist", "icon": "143"},
+        "dt": 1700000000,
+    }
+    _seed_cache(tmp_cache, key, {"current": current, "forecast": []})
+    ancient = time.time() - 30 * 86400
+    os.utime(tmp_cache._path_for(f"{key}:current"), (ancient, ancient))
+
+    # No mocked endpoints: the blocking fetch fails with a connection error
+    payload, stale = svc.get_weather("Lima")
+    assert stale
+    assert payload.source == "cache"
+    assert payload.current.city == "Lima"
+
+
+@responses.activate
+def test_search_served_from_prefix_cache(tmp_cache: FileCache) -> None:
+    svc = WeatherService(api_key="test", cache=tmp_cache)
+    responses.add(
+        responses.GET,
+        f"{svc.BASE_URL}/search.json",
+        json=[
+            {"name": "London", "region": "", "country": "UK", "lat": 51.5, "lon": -0.1},
+            {"name": "Lonavala", "region": "", "country": "India", "lat": 18.7, "lon": 73.4},
+        ],
+        status=200,
+    )
+
+    assert len(svc.search_locations("Lon")) == 2
+    assert [it["name"] for it in svc.search_locations("Lond")] == ["London"]
+    assert [it["name"] for it in svc.search_locations("LONDON")] == ["London"]
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_refresh_not_modified_renews_entry(tmp_cache: FileCache) -> None:
+    svc = WeatherService(api_key="test", cache=tmp_cache)
+    key = _cache_key("Rome", "metric")
+    current = {"city": "Rome", "country": "IT"}
+    tmp_cache.set(f"{key}:current", {"data": current, "etag": '"abc"'}, ttl=-1)
+    responses.add(responses.GET, f"{svc.BASE_URL}/current.json", status=304)
+
+    svc._refresh(key, "Rome", "metric", ["current"])
+
+    assert responses.calls[0].request.headers["If-None-Match"] == '"abc"'
+    entry = tmp_cache.get(f"{key}:current")
+    assert entry["data"] == current
+    assert entry["etag"] == '"abc"'
+    assert entry["__expired__"] is False
+
+
+@responses.activate
+def test_search_truncated_prefix_goes_to_network(tmp_cache: FileCache) -> None:
+    svc = WeatherService(api_key="test", cache=tmp_cache)
+    page = [
+        {"name": f"London {i}", "region": "", "country": "UK", "lat": 51.5, "lon": -0.1}
+        for i in range(SEARCH_UPSTREAM_CAP)
+    ]
+    responses.add(responses.GET, f"{svc.BASE_URL}/search.json", json=page, status=200)
+    responses.add(
+        responses.GET,
+        f"{svc.BASE_URL}/search.json",
+        json=[{"name": "Londonderry", "region": "", "country": "UK", "lat": 55.0, "lon": -7.3}],
+        status=200,
+    )
+
+    svc.search_locations("Lon")
+    assert [it["name"] for it in svc.search_locations("Lond")] == ["Londonderry"]
+    assert len(responses.calls) == 2